@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+import time
+
+# Mede o tempo de inicializacao da CLI em comandos curtos (processo novo a cada execucao)
+
+COMANDOS = [
+    ["--help"],
+    ["stats"],
+    ["export", "--help"],
+]
+REPETICOES = 5
+CLI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cli.py")
+
+
+def medir(comando):
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, CLI, *comando], capture_output=True, check=True)
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), sum(tempos) / len(tempos)
+
+
+def main():
+    print(f"{'comando':<20}{'min (s)':>10}{'media (s)':>12}")
+    for comando in COMANDOS:
+        minimo, media = medir(comando)
+        print(f"{' '.join(comando):<20}{minimo:>10.3f}{media:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import argparse
+import fnmatch
+import importlib.util
+import json
+import os
+import sys
+
+# CLI unica para as duas missoes. Os modulos (e suas dependencias pesadas)
+# so sao carregados pelo subcomando que precisa deles.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# "missao 2.py" tem espaco no nome, entao e carregado pelo caminho
+def carregar_missao2():
+    spec = importlib.util.spec_from_file_location("missao2", os.path.join(BASE_DIR, "missao 2.py"))
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def carregar_scraper(csv_path):
+    import missao3
+
+    missao3.setup_logging(log_file=None)
+    scraper = missao3.LinkedInJobsScraper()
+    scraper.load_existing_csv(csv_path or missao3.HISTORY_PATTERN)
+    return scraper
+
+
+def cmd_enrich(args):
+    missao2 = carregar_missao2()
+
+    # busca avulsa de CNPJ para uma empresa
+    if args.empresa:
+        driver = missao2.configurar_driver()
+        try:
+            cnpj = missao2.buscar_cnpj(driver, missao2.normalizar_nome(args.empresa))
+        finally:
+            driver.quit()
+        print(cnpj or "CNPJ não encontrado")
+        return 0 if cnpj else 1
+
+    missao2.processar_base(
+        args.entrada or missao2.ARQUIVO_ENTRADA,
+        args.saida or missao2.ARQUIVO_SAIDA,
+        args.base_cnpj
+    )
+    return 0
+
+
+def cmd_import_cnpj(args):
+    import registro_cnpj
+
+    try:
+        linhas = registro_cnpj.importar_dump(
+            args.dump,
+            args.destino or registro_cnpj.DIRETORIO_BASE_CNPJ,
+            args.chunksize or registro_cnpj.TAMANHO_CHUNK
+        )
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Importação cancelada, base mantida: {e}")
+        return 1
+
+    for tabela, total in linhas.items():
+        print(f"{tabela}: {total} linhas")
+    return 0
+
+
+def cmd_scrape(args):
+    import missao3
+
+    missao3.main()
+    return 0
+
+
+def cmd_stats(args):
+    scraper = carregar_scraper(args.csv)
+    print(json.dumps(scraper.get_stats(), ensure_ascii=False, indent=2))
+    return 0
+
+
+# Exporta apenas o CSV, sem o arquivo de estatisticas do historico
+def cmd_export(args):
+    import logging
+    from missao3 import HISTORY_PATTERN, write_jobs_csv
+
+    scraper = carregar_scraper(args.csv)
+
+    jobs = scraper.jobs_collected
+    if args.keyword:
+        jobs = [job for job in jobs if job.search_keyword == args.keyword]
+
+    if fnmatch.fnmatch(os.path.basename(args.saida), HISTORY_PATTERN):
+        logging.warning(
+            f"{args.saida} segue o padrão {HISTORY_PATTERN} e será carregado como histórico nas próximas execuções"
+        )
+
+    write_jobs_csv(args.saida, jobs)
+    print(f"{len(jobs)} vagas exportadas para {args.saida}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Enriquecimento de empresas e scraping de vagas")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    enrich = subparsers.add_parser("enrich", help="enriquece a planilha de empresas (missao 2)")
+    enrich.add_argument("--entrada", help="planilha de entrada (padrão: ARQUIVO_ENTRADA)")
+    enrich.add_argument("--saida", help="planilha de saída (padrão: ARQUIVO_SAIDA)")
+    enrich.add_argument("--empresa", help="busca apenas o CNPJ desta empresa")
+    enrich.add_argument("--base-cnpj", help="base local do CNPJ (padrão: DIRETORIO_BASE_CNPJ)")
+    enrich.set_defaults(func=cmd_enrich)
+
+    import_cnpj = subparsers.add_parser(
+        "import-cnpj", help="importa o dump de dados abertos do CNPJ da Receita Federal"
+    )
+    import_cnpj.add_argument("dump", help="pasta com os arquivos do dump (zip ou csv)")
+    import_cnpj.add_argument("--destino", help="pasta da base local (padrão: DIRETORIO_BASE_CNPJ)")
+    import_cnpj.add_argument("--chunksize", type=int, help="linhas lidas por vez (padrão: TAMANHO_CHUNK)")
+    import_cnpj.set_defaults(func=cmd_import_cnpj)
+
+    scrape = subparsers.add_parser("scrape", help="executa o scraper de vagas do LinkedIn (missao 3)")
+    scrape.set_defaults(func=cmd_scrape)
+
+    stats = subparsers.add_parser("stats", help="estatísticas das vagas já coletadas")
+    stats.add_argument("--csv", help="CSV de vagas (padrão: o mais recente)")
+    stats.set_defaults(func=cmd_stats)
+
+    export = subparsers.add_parser("export", help="exporta as vagas coletadas para um novo CSV")
+    export.add_argument("saida", help="arquivo CSV de saída")
+    export.add_argument("--csv", help="CSV de vagas (padrão: o mais recente)")
+    export.add_argument("--keyword", help="exporta apenas vagas desta palavra-chave")
+    export.set_defaults(func=cmd_export)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
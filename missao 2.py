@@ -1,20 +1,17 @@
 import re
-import requests
-import pandas as pd
 import time
 import unicodedata
 import random
+from abc import ABC, abstractmethod
+from collections import deque
 from urllib.parse import quote
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.action_chains import ActionChains
+
+# requests, pandas e selenium sao importados dentro das funcoes que os usam,
+# para que importar este modulo (ou rodar comandos curtos da CLI) seja rapido
 
 # configuracoes
 GOOGLE_API_KEY = "API_KEY"
-SEARCH_ENGINE_ID = "ENGINE_KEY
+SEARCH_ENGINE_ID = "ENGINE_KEY"
 ARQUIVO_ENTRADA = "Planilha sem título (1).xlsx"
 ARQUIVO_SAIDA = "empresas_enriquecidas.xlsx"
 
@@ -40,6 +37,8 @@ def delay_aleatorio(min_seg=2, max_seg=5):
 
 # Simular movimento de mouse
 def mover_mouse_aleatorio(driver):
+    from selenium.webdriver.common.action_chains import ActionChains
+
     try:
         action = ActionChains(driver)
         action.move_by_offset(
@@ -53,6 +52,9 @@ def mover_mouse_aleatorio(driver):
 
 # configuracoes do driver
 def configurar_driver():
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
     chrome_options = Options()
 
     chrome_options.add_argument("--headless=new")
@@ -82,11 +84,20 @@ def configurar_driver():
 
     return driver
 
+# Erro da fonte (site fora do ar, falha de carregamento), diferente de
+# "empresa nao encontrada", que e retornado como None
+class ErroFonte(Exception):
+    pass
+
+
 # Busca CNPJ no Portal da Transparência
 def buscar_cnpj_transparencia(driver, nome_empresa):
-    try:
-        print(f"Tentando Portal da Transparência para: {nome_empresa}")
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
 
+    try:
         wait = WebDriverWait(driver, 15)
         termo_encoded = quote(nome_empresa)
         url = f"https://portaldatransparencia.gov.br/busca?termo={termo_encoded}&pessoaJuridica=true"
@@ -97,12 +108,16 @@ def buscar_cnpj_transparencia(driver, nome_empresa):
         mover_mouse_aleatorio(driver)
 
         # Busca o link do primeiro resultado
-        link_resultado = wait.until(
-            EC.presence_of_element_located((
-                By.XPATH,
-                "/html/body/main/div/div[2]/section/div/div/div[1]/div[2]/ul/div[1]/h4/a"
-            ))
-        )
+        try:
+            link_resultado = wait.until(
+                EC.presence_of_element_located((
+                    By.XPATH,
+                    "/html/body/main/div/div[2]/section/div/div/div[1]/div[2]/ul/div[1]/h4/a"
+                ))
+            )
+        except TimeoutException:
+            print("Nenhum resultado no Portal da Transparência")
+            return None
 
         href = link_resultado.get_attribute("href")
 
@@ -117,11 +132,16 @@ def buscar_cnpj_transparencia(driver, nome_empresa):
 
     except Exception as e:
         print(f"Erro no Portal da Transparência: {e}")
-        return None
+        raise ErroFonte(str(e)) from e
 
 
 # Busca o CNPJ da empresa no ConsultasCNPJ
 def buscar_cnpj_consultascnpj(driver, nome_empresa):
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
     try:
         wait = WebDriverWait(driver, 15)
 
@@ -152,13 +172,17 @@ def buscar_cnpj_consultascnpj(driver, nome_empresa):
 
         delay_aleatorio(2, 4)
 
-        # primeiro resultado
-        resultado = wait.until(
-            EC.presence_of_element_located((
-                By.XPATH,
-                "/html/body/main/div/div[2]/div/div/div[1]/div[6]/div[2]/div/div/div[1]/div[1]/div/div[1]/div/a"
-            ))
-        )
+        # primeiro resultado, se nao aparecer a empresa nao esta listada
+        try:
+            resultado = wait.until(
+                EC.presence_of_element_located((
+                    By.XPATH,
+                    "/html/body/main/div/div[2]/div/div/div[1]/div[6]/div[2]/div/div/div[1]/div[1]/div/div[1]/div/a"
+                ))
+            )
+        except TimeoutException:
+            print("Nenhum resultado no ConsultasCNPJ")
+            return None
 
         url_resultado = resultado.get_attribute("href")
 
@@ -184,28 +208,168 @@ def buscar_cnpj_consultascnpj(driver, nome_empresa):
 
     except Exception as e:
         print(f"Erro no ConsultasCNPJ: {e}")
+        raise ErroFonte(str(e)) from e
+
+
+# Interface comum das fontes de CNPJ. buscar retorna o CNPJ ou None se a
+# empresa nao for encontrada, e levanta ErroFonte se a fonte falhar
+class FonteCNPJ(ABC):
+    nome = ""
+
+    @abstractmethod
+    def buscar(self, driver, nome_empresa):
+        pass
+
+
+class FonteConsultasCNPJ(FonteCNPJ):
+    nome = "ConsultasCNPJ"
+
+    def buscar(self, driver, nome_empresa):
+        return buscar_cnpj_consultascnpj(driver, nome_empresa)
+
+
+class FontePortalTransparencia(FonteCNPJ):
+    nome = "Portal da Transparência"
+
+    def buscar(self, driver, nome_empresa):
+        return buscar_cnpj_transparencia(driver, nome_empresa)
+
+
+# Historico de uma fonte em janela deslizante, com circuit breaker.
+# Apenas erros da fonte contam como falha, "nao encontrado" e uma resposta valida
+class EstadoFonte:
+    def __init__(self, fonte, janela=20, limite_falhas=3, intervalo_sonda=300):
+        self.fonte = fonte
+        self.resultados = deque(maxlen=janela)  # (sucesso, latencia)
+        self.limite_falhas = limite_falhas
+        self.intervalo_sonda = intervalo_sonda
+        self.falhas_consecutivas = 0
+        self.aberto_desde = None
+        self.ultima_tentativa = 0
+
+    # Sem historico, a fonte e considerada saudavel
+    def taxa_sucesso(self):
+        if not self.resultados:
+            return 1.0
+        return sum(1 for sucesso, _ in self.resultados if sucesso) / len(self.resultados)
+
+    def latencia_media(self):
+        if not self.resultados:
+            return 0.0
+        return sum(latencia for _, latencia in self.resultados) / len(self.resultados)
+
+    # Custo esperado por resposta valida: latencia media dividida pela taxa de sucesso
+    def custo_esperado(self):
+        taxa = self.taxa_sucesso()
+        if taxa == 0:
+            return float("inf")
+        return self.latencia_media() / taxa
+
+    # Circuito fechado, ou aberto ha tempo suficiente para uma sonda
+    def disponivel(self, agora):
+        if self.aberto_desde is None:
+            return True
+        return agora - self.aberto_desde >= self.intervalo_sonda
+
+    # Fonte degradada sem tentativas recentes, deve ser sondada antes das demais
+    def sonda_pendente(self, agora):
+        if self.taxa_sucesso() == 1.0:
+            return False
+        return agora - self.ultima_tentativa >= self.intervalo_sonda
+
+    def registrar(self, sucesso, latencia, agora):
+        self.resultados.append((sucesso, latencia))
+        self.ultima_tentativa = agora
+
+        if sucesso:
+            if self.aberto_desde is not None:
+                print(f"{self.fonte.nome} recuperada, circuito fechado")
+            self.falhas_consecutivas = 0
+            self.aberto_desde = None
+            return
+
+        self.falhas_consecutivas += 1
+        # sonda falhou ou limite atingido, (re)abre o circuito
+        if self.aberto_desde is not None or self.falhas_consecutivas >= self.limite_falhas:
+            self.aberto_desde = agora
+            print(f"{self.fonte.nome} com {self.falhas_consecutivas} falhas seguidas, "
+                  f"circuito aberto por {self.intervalo_sonda}s")
+
+
+# Seleciona a ordem das fontes pelo custo esperado (latencia e taxa de sucesso)
+class SeletorFontes:
+    def __init__(self, fontes, **kwargs_estado):
+        self.kwargs_estado = kwargs_estado
+        self.estados = []
+        for fonte in fontes:
+            self.registrar_fonte(fonte)
+
+    def registrar_fonte(self, fonte):
+        self.estados.append(EstadoFonte(fonte, **self.kwargs_estado))
+
+    # Fontes disponiveis ordenadas: sondas pendentes, depois menor custo esperado
+    def ordenar(self):
+        agora = time.time()
+        disponiveis = [e for e in self.estados if e.disponivel(agora)]
+
+        if disponiveis:
+            return sorted(
+                disponiveis,
+                key=lambda e: (not e.sonda_pendente(agora), e.custo_esperado(), e.latencia_media())
+            )
+
+        # todas com circuito aberto: sonda a que abriu primeiro e mantem as demais
+        # como fallback, na ordem em que foram registradas
+        sonda = min(self.estados, key=lambda e: e.aberto_desde)
+        return [sonda] + [e for e in self.estados if e is not sonda]
+
+    def buscar(self, driver, nome_empresa):
+        for i, estado in enumerate(self.ordenar()):
+            if i > 0:
+                delay_aleatorio(2, 3)
+
+            print(f"Tentando {estado.fonte.nome} para: {nome_empresa}")
+            inicio = time.time()
+            try:
+                cnpj = estado.fonte.buscar(driver, nome_empresa)
+                sucesso = True
+            except ErroFonte:
+                cnpj = None
+                sucesso = False
+            fim = time.time()
+            estado.registrar(sucesso, fim - inicio, fim)
+
+            if cnpj:
+                return cnpj
+
+            print(f"{estado.fonte.nome} sem resultado" if sucesso else f"{estado.fonte.nome} falhou")
+
         return None
 
+    def resumo(self):
+        return {
+            e.fonte.nome: {
+                "taxa_sucesso": round(e.taxa_sucesso(), 2),
+                "latencia_media": round(e.latencia_media(), 1),
+                "circuito_aberto": e.aberto_desde is not None,
+            }
+            for e in self.estados
+        }
 
-# Função principal de busca de CNPJ
-def buscar_cnpj(driver, nome_empresa):
-    # Tenta primeiro no ConsultasCNPJ
-    print(f"Tentando ConsultasCNPJ para: {nome_empresa}")
-    cnpj = buscar_cnpj_consultascnpj(driver, nome_empresa)
 
-    if cnpj:
-        return cnpj
+SELETOR_FONTES = SeletorFontes([FonteConsultasCNPJ(), FontePortalTransparencia()])
 
-    # Se falhar, tenta no Portal da Transparência
-    print("ConsultasCNPJ falhou, tentando Portal da Transparência...")
-    delay_aleatorio(2, 3)
-    cnpj = buscar_cnpj_transparencia(driver, nome_empresa)
 
-    return cnpj
+# Função principal de busca de CNPJ
+def buscar_cnpj(driver, nome_empresa, seletor=None):
+    seletor = seletor or SELETOR_FONTES
+    return seletor.buscar(driver, nome_empresa)
 
 
 # Busca o site da empresa via google api
 def buscar_site_google(razao_social, cidade):
+    import requests
+
     url = "https://www.googleapis.com/customsearch/v1"
     termo = re.sub(r'\b(LTDA|S\.A\.?|S/A|LIMITADA|EIRELI|ME|EPP)\b', '', razao_social, flags=re.IGNORECASE).strip()
     query = f'"{termo}" {cidade} site oficial'
@@ -244,17 +408,44 @@ def normalizar_qsa(qsa, max_socios=3):
     return resultado
 
 
+# Aplica os dados cadastrais (BrasilAPI ou base local) e busca o site
+def aplicar_dados_cnpj(info_empresa, dados_cnpj, nome_busca_normalizado):
+    import pandas as pd
+
+    qsa = dados_cnpj.pop("qsa", [])
+
+    # normaliza dados principais
+    df_temp = pd.json_normalize(dados_cnpj)
+    dados_normalizados = df_temp.to_dict(orient="records")[0]
+    info_empresa.update(dados_normalizados)
+
+    # normaliza qsa
+    info_empresa.update(normalizar_qsa(qsa))
+
+    # googleapi
+    razao = info_empresa.get('razao_social', nome_busca_normalizado)
+    cidade = info_empresa.get('municipio', '')
+    print(f"Buscando site para: {razao}")
+    info_empresa["Site Encontrado"] = buscar_site_google(razao, cidade)
+    print(f"Site: {info_empresa['Site Encontrado']}")
+
+
 # carregando base de empresas
-def processar_base():
+def processar_base(arquivo_entrada=ARQUIVO_ENTRADA, arquivo_saida=ARQUIVO_SAIDA, base_cnpj=None):
+    import requests
+    import pandas as pd
+    from registro_cnpj import DIRETORIO_BASE_CNPJ, consultar_cnpjs
+
     try:
-        df_input = pd.read_excel(ARQUIVO_ENTRADA)
+        df_input = pd.read_excel(arquivo_entrada)
     except Exception as e:
         print(f"Erro ao ler Excel: {e}")
         return
 
     driver = configurar_driver()
-    resultados_finais = []
+    empresas = []
 
+    # 1a etapa: busca dos CNPJs
     for index, row in df_input.iterrows():
         nome_original = row['company_name']
         nome_busca_normalizado = normalizar_nome(nome_original)
@@ -270,43 +461,11 @@ def processar_base():
         if cnpj:
             cnpj = str(cnpj).zfill(14)
             print(f"✓ CNPJ encontrado: {cnpj}")
-
-            # Delay antes da API
-            delay_aleatorio(1, 2)
-
-            # Busca dos dados cadastrais na brasilapi
-            try:
-                res_api = requests.get(f"https://brasilapi.com.br/api/cnpj/v1/{cnpj}", timeout=15)
-                if res_api.status_code == 200:
-                    dados_cnpj = res_api.json()
-
-                    qsa = dados_cnpj.pop("qsa", [])
-
-                    # normaliza dados principais
-                    df_temp = pd.json_normalize(dados_cnpj)
-                    dados_normalizados = df_temp.to_dict(orient="records")[0]
-                    info_empresa.update(dados_normalizados)
-
-                    # normaliza qsa
-                    info_empresa.update(normalizar_qsa(qsa))
-
-                    # googleapi
-                    razao = info_empresa.get('razao_social', nome_busca_normalizado)
-                    cidade = info_empresa.get('municipio', '')
-                    print(f"Buscando site para: {razao}")
-                    info_empresa["Site Encontrado"] = buscar_site_google(razao, cidade)
-                    print(f"Site: {info_empresa['Site Encontrado']}")
-                else:
-                    print(f"BrasilAPI status {res_api.status_code}")
-                    info_empresa["Erro_Log"] = f"BrasilAPI Status {res_api.status_code}"
-            except Exception as e:
-                print(f"Erro na BrasilAPI: {e}")
-                info_empresa["Erro_Log"] = str(e)
         else:
             print("CNPJ não encontrado em nenhuma fonte")
             info_empresa["Erro_Log"] = "CNPJ não encontrado"
 
-        resultados_finais.append(info_empresa)
+        empresas.append((info_empresa, nome_busca_normalizado, cnpj))
 
         # Delay entre empresas para evitar bloqueios
         delay_time = random.uniform(4, 8)
@@ -315,6 +474,46 @@ def processar_base():
 
     driver.quit()
 
+    for nome_fonte, dados_fonte in SELETOR_FONTES.resumo().items():
+        print(f"Fonte {nome_fonte}: {dados_fonte}")
+
+    # 2a etapa: dados cadastrais, consultando todos os CNPJs na base local de uma vez
+    registros_locais = consultar_cnpjs(
+        [cnpj for _, _, cnpj in empresas if cnpj],
+        base_cnpj or DIRETORIO_BASE_CNPJ
+    )
+    print(f"{len(registros_locais)} CNPJs encontrados na base local")
+
+    resultados_finais = []
+    for info_empresa, nome_busca_normalizado, cnpj in empresas:
+        resultados_finais.append(info_empresa)
+
+        if not cnpj:
+            continue
+
+        if cnpj in registros_locais:
+            try:
+                aplicar_dados_cnpj(info_empresa, registros_locais[cnpj], nome_busca_normalizado)
+            except Exception as e:
+                print(f"Erro ao aplicar dados da base local: {e}")
+                info_empresa["Erro_Log"] = str(e)
+            continue
+
+        # Delay antes da API
+        delay_aleatorio(1, 2)
+
+        # Busca dos dados cadastrais na brasilapi, apenas para quem nao esta na base local
+        try:
+            res_api = requests.get(f"https://brasilapi.com.br/api/cnpj/v1/{cnpj}", timeout=15)
+            if res_api.status_code == 200:
+                aplicar_dados_cnpj(info_empresa, res_api.json(), nome_busca_normalizado)
+            else:
+                print(f"BrasilAPI status {res_api.status_code}")
+                info_empresa["Erro_Log"] = f"BrasilAPI Status {res_api.status_code}"
+        except Exception as e:
+            print(f"Erro na BrasilAPI: {e}")
+            info_empresa["Erro_Log"] = str(e)
+
     # gerando df final
     df_final = pd.DataFrame(resultados_finais)
 
@@ -326,10 +525,10 @@ def processar_base():
     if 'cnpj' in df_final.columns:
         df_final['cnpj'] = df_final['cnpj'].apply(lambda x: f"'{x}" if pd.notnull(x) and x != "" else x)
 
-    df_final.to_excel(ARQUIVO_SAIDA, index=False)
+    df_final.to_excel(arquivo_saida, index=False)
     print(f"\n{'=' * 60}")
     print(f"processo concluido")
-    print(f"arquivo final: {ARQUIVO_SAIDA}")
+    print(f"arquivo final: {arquivo_saida}")
 
 
 if __name__ == "__main__":
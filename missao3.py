@@ -1,26 +1,36 @@
-import requests
-from bs4 import BeautifulSoup
 import time
 import random
 import csv
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 import logging
 from dataclasses import dataclass, asdict
 from urllib.parse import urlencode
 import hashlib
 import os
 import glob
+import json
+from collections import Counter
 
-# registro de execução (log)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('scraper.log'),
-        logging.StreamHandler()
-    ]
-)
+# Padrao dos CSVs de historico, o mais recente e carregado a cada execucao
+HISTORY_PATTERN = 'linkedin_jobs_*.csv'
+
+# requests e bs4 sao importados sob demanda, apenas quando ha scraping
+if TYPE_CHECKING:
+    import requests
+
+
+# registro de execução (log), configurado apenas ao executar
+def setup_logging(log_file: Optional[str] = 'scraper.log'):
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.insert(0, logging.FileHandler(log_file))
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=handlers
+    )
 
 # estrutura de dados da vaga
 @dataclass
@@ -35,6 +45,113 @@ class JobListing:
     scraped_at: str
     search_keyword: str
 
+# Estatisticas agregadas de forma incremental, atualizadas em O(1) por vaga
+class JobStats:
+    DIMENSIONS = ('search_keyword', 'location', 'company', 'posted_date')
+
+    def __init__(self):
+        self.total_jobs = 0
+        self.new_jobs = 0
+        self.known_jobs = 0
+        self.counters: Dict[str, Counter] = {dim: Counter() for dim in self.DIMENSIONS}
+        # mtime do CSV salvo junto, para detectar edicoes feitas fora do scraper
+        self.csv_mtime: Optional[float] = None
+
+    # Contabiliza uma vaga ingerida (nova no scraping ou conhecida do historico)
+    def add(self, job: JobListing, is_new: bool = True):
+        self.total_jobs += 1
+        if is_new:
+            self.new_jobs += 1
+        else:
+            self.known_jobs += 1
+
+        for dim in self.DIMENSIONS:
+            self.counters[dim][getattr(job, dim)] += 1
+
+    def unique(self, dimension: str) -> int:
+        return len(self.counters[dimension])
+
+    def top(self, dimension: str, n: int = 5) -> List[tuple]:
+        return self.counters[dimension].most_common(n)
+
+    def summary(self, n: int = 5) -> Dict:
+        return {
+            'total_jobs': self.total_jobs,
+            'new_jobs': self.new_jobs,
+            'known_jobs': self.known_jobs,
+            'unique_companies': self.unique('company'),
+            'keywords_searched': self.unique('search_keyword'),
+            'jobs_per_keyword': dict(self.counters['search_keyword']),
+            'top_locations': self.top('location', n),
+            'top_companies': self.top('company', n),
+            'top_posted_dates': self.top('posted_date', n)
+        }
+
+    # Relatorio de progresso em uma linha
+    def progress_report(self) -> str:
+        keywords = ', '.join(f"{k}={v}" for k, v in self.counters['search_keyword'].items())
+        return (
+            f"{self.total_jobs} vagas ({self.new_jobs} novas, {self.known_jobs} conhecidas) | "
+            f"{self.unique('company')} empresas | {self.unique('location')} localidades | {keywords}"
+        )
+
+    @staticmethod
+    def stats_filename(csv_filename: str) -> str:
+        return os.path.splitext(csv_filename)[0] + '_stats.json'
+
+    # Persiste junto ao CSV de vagas
+    def save(self, filename: str, csv_mtime: Optional[float] = None):
+        self.csv_mtime = csv_mtime
+        data = {
+            'total_jobs': self.total_jobs,
+            'new_jobs': self.new_jobs,
+            'known_jobs': self.known_jobs,
+            'csv_mtime': csv_mtime,
+            'counters': {dim: dict(counter) for dim, counter in self.counters.items()}
+        }
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    # Carrega estatisticas salvas, todas as vagas passam a contar como conhecidas
+    @classmethod
+    def load(cls, filename: str) -> 'JobStats':
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        stats = cls()
+        stats.total_jobs = data['total_jobs']
+        stats.known_jobs = data['total_jobs']
+        stats.csv_mtime = data.get('csv_mtime')
+        for dim in cls.DIMENSIONS:
+            stats.counters[dim] = Counter(data['counters'].get(dim, {}))
+        return stats
+
+# Escreve as vagas em CSV, no formato lido por load_existing_csv
+def write_jobs_csv(filename: str, jobs: List[JobListing]):
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+
+        # Cabeçalho
+        writer.writerow([
+            'job_id', 'title', 'company', 'location',
+            'description', 'posted_date', 'url',
+            'scraped_at', 'search_keyword'
+        ])
+
+        # Dados
+        for job in jobs:
+            writer.writerow([
+                job.job_id,
+                job.title,
+                job.company,
+                job.location,
+                job.description,
+                job.posted_date,
+                job.url,
+                job.scraped_at,
+                job.search_keyword
+            ])
+
 # Rate Limiter, controla a velocidade das requisicoes HTTP
 class RateLimiter:
     # Tempo entre requisicoes
@@ -77,7 +194,15 @@ class RequestHandler:
 
     def __init__(self, max_retries=3):
         self.max_retries = max_retries
-        self.session = requests.Session()
+        self._session = None
+
+    # Sessao criada na primeira requisicao
+    @property
+    def session(self) -> 'requests.Session':
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
 
     # Header de requisicao
     def get_headers(self) -> Dict[str, str]:
@@ -96,7 +221,9 @@ class RequestHandler:
         }
 
     # Requisicao com os rate limiters
-    def make_request(self, url: str, rate_limiter: RateLimiter) -> Optional[requests.Response]:
+    def make_request(self, url: str, rate_limiter: RateLimiter) -> Optional['requests.Response']:
+        import requests
+
         for attempt in range(self.max_retries):
             try:
                 rate_limiter.wait()
@@ -150,13 +277,13 @@ class LinkedInJobsScraper:
         self.rate_limiter = RateLimiter(min_delay=3, max_delay=15)
         self.jobs_collected = []
         self.jobs_seen = set()
-        self.new_jobs_count = 0
+        self.stats = JobStats()
 
     def generate_job_id(self, title: str, company: str) -> str:
         unique_str = f"{title}|{company}|{datetime.now().date()}"
         return hashlib.md5(unique_str.encode()).hexdigest()[:16]
 
-    def load_existing_csv(self, pattern: str = 'linkedin_jobs_*.csv') -> int:
+    def load_existing_csv(self, pattern: str = HISTORY_PATTERN) -> int:
         csv_files = glob.glob(pattern)
 
         if not csv_files:
@@ -187,6 +314,8 @@ class LinkedInJobsScraper:
                     self.jobs_seen.add(job.job_id)
                     loaded_count += 1
 
+            self.load_stats(latest_csv)
+
             logging.info(f"{loaded_count} vagas carregadas do histórico")
             return loaded_count
 
@@ -194,6 +323,25 @@ class LinkedInJobsScraper:
             logging.error(f"Erro ao carregar CSV: {e}")
             return 0
 
+    # Usa as estatisticas salvas com o CSV; se ausentes ou divergentes, recalcula
+    def load_stats(self, csv_filename: str):
+        stats_file = JobStats.stats_filename(csv_filename)
+        try:
+            stats = JobStats.load(stats_file)
+            if (stats.total_jobs == len(self.jobs_collected)
+                    and stats.csv_mtime == os.path.getmtime(csv_filename)):
+                self.stats = stats
+                return
+            logging.warning(f"Estatísticas em {stats_file} divergem do CSV, recalculando")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"Erro ao carregar estatísticas: {e}")
+
+        self.stats = JobStats()
+        for job in self.jobs_collected:
+            self.stats.add(job, is_new=False)
+
     def build_search_url(self, keyword: str, location: str = "", start: int = 0) -> str:
         params = {
             'keywords': keyword,
@@ -251,6 +399,8 @@ class LinkedInJobsScraper:
 
     # Busca por vaga especifica em localidade definida
     def scrape_search(self, keyword: str, location: str = "", max_pages: int = 5) -> int:
+        from bs4 import BeautifulSoup
+
         jobs_this_search = 0
 
         logging.info(f"iniciando scrape: keyword='{keyword}', location='{location}'")
@@ -280,9 +430,9 @@ class LinkedInJobsScraper:
                 if job and job.job_id not in self.jobs_seen:
                     self.jobs_collected.append(job)
                     self.jobs_seen.add(job.job_id)
+                    self.stats.add(job, is_new=True)
                     jobs_this_search += 1
                     page_jobs += 1
-                    self.new_jobs_count += 1
 
             logging.info(f"Página {page + 1}: {page_jobs} vagas novas processadas")
 
@@ -299,45 +449,18 @@ class LinkedInJobsScraper:
             logging.warning("Nenhuma vaga para salvar")
             return
 
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-
-            # Cabeçalho
-            writer.writerow([
-                'job_id', 'title', 'company', 'location',
-                'description', 'posted_date', 'url',
-                'scraped_at', 'search_keyword'
-            ])
-
-            # Dados
-            for job in self.jobs_collected:
-                writer.writerow([
-                    job.job_id,
-                    job.title,
-                    job.company,
-                    job.location,
-                    job.description,
-                    job.posted_date,
-                    job.url,
-                    job.scraped_at,
-                    job.search_keyword
-                ])
+        write_jobs_csv(filename, self.jobs_collected)
+        self.stats.save(JobStats.stats_filename(filename), os.path.getmtime(filename))
 
         logging.info(f"Dados salvos em {filename}")
 
     def get_stats(self) -> Dict:
-        companies = set(job.company for job in self.jobs_collected)
-        keywords = set(job.search_keyword for job in self.jobs_collected)
-
-        return {
-            'total_jobs': len(self.jobs_collected),
-            'new_jobs': self.new_jobs_count,
-            'unique_companies': len(companies),
-            'keywords_searched': len(keywords)
-        }
+        return self.stats.summary()
 
 
 def main():
+    setup_logging()
+
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     csv_filename = f'linkedin_jobs_{timestamp}.csv'
 
@@ -367,7 +490,8 @@ def main():
             location=search['location'],
             max_pages=3
         )
-        print(f"✅ {jobs} vagas novas coletadas\n")
+        print(f"✅ {jobs} vagas novas coletadas")
+        print(f"Progresso: {scraper.stats.progress_report()}\n")
 
         # Sleep entre buscas
         if i < len(searches):
@@ -382,6 +506,9 @@ def main():
     print("finalizando scraping")
     print(f"Total de vagas no banco: {stats['total_jobs']}")
     print(f"Vagas novas: {stats['new_jobs']}")
+    print(f"Empresas únicas: {stats['unique_companies']}")
+    print(f"Vagas por palavra-chave: {stats['jobs_per_keyword']}")
+    print(f"Principais localidades: {stats['top_locations']}")
     print(f"\nDados salvos em: {csv_filename}")
     print("=" * 60)
 
@@ -0,0 +1,337 @@
+import glob
+import os
+import shutil
+import tempfile
+
+# Base local com o dump de dados abertos do CNPJ da Receita Federal.
+# Os arquivos (csv separados por ";", sem cabecalho, latin-1, zipados ou nao)
+# sao lidos em chunks e gravados em parquet. Empresas, estabelecimentos e
+# socios ficam particionados pelos 2 primeiros digitos do cnpj_basico, que
+# servem de indice na consulta. Requer pandas com pyarrow.
+
+DIRETORIO_BASE_CNPJ = "base_cnpj"
+TAMANHO_CHUNK = 500_000
+
+# Layout das tabelas do dump, com os nomes de campo usados pela BrasilAPI
+COLUNAS = {
+    "empresas": [
+        "cnpj_basico", "razao_social", "codigo_natureza_juridica", "qualificacao_do_responsavel",
+        "capital_social", "codigo_porte", "ente_federativo_responsavel"
+    ],
+    "estabelecimentos": [
+        "cnpj_basico", "cnpj_ordem", "cnpj_dv", "identificador_matriz_filial", "nome_fantasia",
+        "situacao_cadastral", "data_situacao_cadastral", "motivo_situacao_cadastral",
+        "nome_cidade_no_exterior", "codigo_pais", "data_inicio_atividade", "cnae_fiscal",
+        "cnaes_secundarios", "descricao_tipo_de_logradouro", "logradouro", "numero", "complemento",
+        "bairro", "cep", "uf", "codigo_municipio", "ddd_1", "telefone_1", "ddd_2", "telefone_2",
+        "ddd_fax", "fax", "email", "situacao_especial", "data_situacao_especial"
+    ],
+    "socios": [
+        "cnpj_basico", "identificador_de_socio", "nome_socio", "cnpj_cpf_do_socio",
+        "codigo_qualificacao_socio", "data_entrada_sociedade", "codigo_pais",
+        "cpf_representante_legal", "nome_representante_legal",
+        "codigo_qualificacao_representante_legal", "codigo_faixa_etaria"
+    ],
+    "municipios": ["codigo", "descricao"],
+    "qualificacoes": ["codigo", "descricao"],
+    "cnaes": ["codigo", "descricao"],
+    "naturezas": ["codigo", "descricao"],
+    "motivos": ["codigo", "descricao"],
+    "paises": ["codigo", "descricao"],
+}
+
+# Trechos do nome do arquivo (zip ou csv extraido) que identificam a tabela
+ARQUIVOS_TABELA = {
+    "empresas": ("empre",),
+    "estabelecimentos": ("estabele",),
+    "socios": ("socio",),
+    "municipios": ("munic",),
+    "qualificacoes": ("qual",),
+    "cnaes": ("cnae",),
+    "naturezas": ("natju", "naturez"),
+    "motivos": ("moti",),
+    "paises": ("pais",),
+}
+
+TABELAS_PARTICIONADAS = {"empresas", "estabelecimentos", "socios"}
+
+# Dominios fixos do layout da Receita, com as descricoes da BrasilAPI
+MATRIZ_FILIAL = {1: "MATRIZ", 2: "FILIAL"}
+SITUACOES_CADASTRAIS = {1: "NULA", 2: "ATIVA", 3: "SUSPENSA", 4: "INAPTA", 8: "BAIXADA"}
+PORTES = {0: "NÃO INFORMADO", 1: "MICRO EMPRESA", 3: "EMPRESA DE PEQUENO PORTE", 5: "DEMAIS"}
+FAIXAS_ETARIAS = {
+    0: "Não se aplica",
+    1: "Entre 0 a 12 anos",
+    2: "Entre 13 a 20 anos",
+    3: "Entre 21 a 30 anos",
+    4: "Entre 31 a 40 anos",
+    5: "Entre 41 a 50 anos",
+    6: "Entre 51 a 60 anos",
+    7: "Entre 61 a 70 anos",
+    8: "Entre 71 a 80 anos",
+    9: "Maiores de 80 anos",
+}
+
+# Campos numericos e datas (AAAAMMDD no dump, ISO na BrasilAPI)
+CAMPOS_INTEIROS = [
+    "identificador_matriz_filial", "situacao_cadastral", "motivo_situacao_cadastral", "codigo_pais",
+    "cnae_fiscal", "codigo_municipio", "codigo_natureza_juridica", "qualificacao_do_responsavel",
+    "codigo_porte"
+]
+CAMPOS_DATA = ["data_situacao_cadastral", "data_inicio_atividade", "data_situacao_especial"]
+CAMPOS_INTEIROS_SOCIO = [
+    "identificador_de_socio", "codigo_qualificacao_socio", "codigo_pais",
+    "codigo_qualificacao_representante_legal", "codigo_faixa_etaria"
+]
+
+
+def identificar_tabela(caminho):
+    nome = os.path.basename(caminho).lower()
+    for tabela, trechos in ARQUIVOS_TABELA.items():
+        if any(trecho in nome for trecho in trechos):
+            return tabela
+    return None
+
+
+# Le um arquivo do dump em chunks e grava cada chunk em parquet
+def importar_arquivo(caminho, tabela, destino=DIRETORIO_BASE_CNPJ, chunksize=TAMANHO_CHUNK):
+    import pandas as pd
+
+    nome_arquivo = os.path.basename(caminho)
+    leitor = pd.read_csv(
+        caminho,
+        sep=";",
+        header=None,
+        names=COLUNAS[tabela],
+        dtype=str,
+        encoding="latin-1",
+        keep_default_na=False,
+        chunksize=chunksize
+    )
+
+    linhas = 0
+    for n, chunk in enumerate(leitor):
+        if tabela in TABELAS_PARTICIONADAS:
+            for prefixo, parte in chunk.groupby(chunk["cnpj_basico"].str[:2]):
+                pasta = os.path.join(destino, tabela, prefixo)
+                os.makedirs(pasta, exist_ok=True)
+                parte.to_parquet(os.path.join(pasta, f"{nome_arquivo}-{n}.parquet"), index=False)
+        else:
+            pasta = os.path.join(destino, tabela)
+            os.makedirs(pasta, exist_ok=True)
+            chunk.to_parquet(os.path.join(pasta, f"{nome_arquivo}-{n}.parquet"), index=False)
+
+        linhas += len(chunk)
+        print(f"{nome_arquivo}: {linhas} linhas importadas")
+
+    return linhas
+
+
+TABELAS_OBRIGATORIAS = {"empresas", "estabelecimentos", "socios"}
+
+
+# Copia um arquivo da base antiga por hard link (os parquets nunca sao
+# alterados depois de gravados), ou por copia se o link nao for suportado
+def vincular_arquivo(origem, destino):
+    try:
+        os.link(origem, destino)
+    except OSError:
+        shutil.copy2(origem, destino)
+
+
+# Importa os arquivos do dump em uma pasta temporaria, que so substitui a base
+# existente depois que todas as tabelas foram importadas. Tabelas ausentes do
+# dump sao mantidas da base anterior
+def importar_dump(diretorio_dump, destino=DIRETORIO_BASE_CNPJ, chunksize=TAMANHO_CHUNK):
+    if not os.path.isdir(diretorio_dump):
+        raise FileNotFoundError(f"Pasta do dump não encontrada: {diretorio_dump}")
+
+    arquivos_por_tabela = {}
+    for caminho in sorted(glob.glob(os.path.join(diretorio_dump, "*"))):
+        tabela = identificar_tabela(caminho)
+        if tabela:
+            arquivos_por_tabela.setdefault(tabela, []).append(caminho)
+        else:
+            print(f"Arquivo ignorado: {caminho}")
+
+    if not arquivos_por_tabela:
+        raise ValueError(f"Nenhum arquivo do dump do CNPJ encontrado em {diretorio_dump}")
+
+    destino = os.path.abspath(destino)
+    temporario = tempfile.mkdtemp(prefix=os.path.basename(destino) + ".tmp-", dir=os.path.dirname(destino))
+    try:
+        resultado = {}
+        for tabela, arquivos in arquivos_por_tabela.items():
+            resultado[tabela] = sum(importar_arquivo(a, tabela, temporario, chunksize) for a in arquivos)
+
+        for tabela in COLUNAS:
+            pasta_antiga = os.path.join(destino, tabela)
+            if tabela in arquivos_por_tabela:
+                continue
+            if os.path.isdir(pasta_antiga):
+                shutil.copytree(pasta_antiga, os.path.join(temporario, tabela), copy_function=vincular_arquivo)
+                print(f"Tabela {tabela} ausente no dump, mantida da base anterior")
+            else:
+                print(f"Tabela {tabela} ausente no dump e na base anterior")
+
+        faltando = sorted(t for t in TABELAS_OBRIGATORIAS if not os.path.isdir(os.path.join(temporario, t)))
+        if faltando:
+            raise ValueError(f"Base incompleta, faltam as tabelas: {', '.join(faltando)}")
+    except BaseException:
+        shutil.rmtree(temporario, ignore_errors=True)
+        raise
+
+    # troca a base antiga pela nova
+    antigo = None
+    if os.path.exists(destino):
+        antigo = temporario + ".old"
+        os.rename(destino, antigo)
+    os.rename(temporario, destino)
+    if antigo:
+        shutil.rmtree(antigo, ignore_errors=True)
+
+    return resultado
+
+
+# Le uma tabela da base local, apenas as particoes dos cnpj_basico pedidos
+def ler_tabela(tabela, basicos=None, destino=DIRETORIO_BASE_CNPJ):
+    import pandas as pd
+
+    pasta = os.path.join(destino, tabela)
+    if not os.path.isdir(pasta):
+        return pd.DataFrame(columns=COLUNAS[tabela])
+
+    if tabela not in TABELAS_PARTICIONADAS:
+        return pd.read_parquet(pasta)
+
+    basicos_por_prefixo = {}
+    for basico in basicos or []:
+        basicos_por_prefixo.setdefault(basico[:2], []).append(basico)
+
+    partes = []
+    for prefixo, grupo in basicos_por_prefixo.items():
+        pasta_prefixo = os.path.join(pasta, prefixo)
+        if os.path.isdir(pasta_prefixo):
+            partes.append(pd.read_parquet(pasta_prefixo, filters=[("cnpj_basico", "in", grupo)]))
+
+    if not partes:
+        return pd.DataFrame(columns=COLUNAS[tabela])
+    return pd.concat(partes, ignore_index=True)
+
+
+# Tabela de codigo -> descricao (cnaes, naturezas, paises...), com codigo inteiro
+def ler_mapa(tabela, destino=DIRETORIO_BASE_CNPJ):
+    import pandas as pd
+
+    df = ler_tabela(tabela, destino=destino)
+    codigos = pd.to_numeric(df["codigo"], errors="coerce")
+    return {int(c): d for c, d in zip(codigos, df["descricao"]) if pd.notna(c)}
+
+
+def para_inteiro(serie):
+    import pandas as pd
+
+    return pd.to_numeric(serie, errors="coerce").astype("Int64")
+
+
+def para_data(serie):
+    import pandas as pd
+
+    return pd.to_datetime(serie, format="%Y%m%d", errors="coerce").dt.strftime("%Y-%m-%d")
+
+
+# DataFrame -> lista de dicts, com None no lugar de NaN/NA
+def para_registros(df):
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+# Consulta varios CNPJs de uma vez. Os registros seguem os nomes, tipos e
+# descricoes da BrasilAPI (com "qsa"); campos que nao existem no dump, como
+# os do Simples Nacional, ficam de fora
+def consultar_cnpjs(cnpjs, destino=DIRETORIO_BASE_CNPJ):
+    import pandas as pd
+
+    cnpjs = {str(c).zfill(14) for c in cnpjs if c}
+    if not cnpjs or not os.path.isdir(destino):
+        return {}
+
+    basicos = {c[:8] for c in cnpjs}
+
+    estabelecimentos = ler_tabela("estabelecimentos", basicos, destino)
+    if estabelecimentos.empty:
+        return {}
+
+    estabelecimentos["cnpj"] = (
+        estabelecimentos["cnpj_basico"] + estabelecimentos["cnpj_ordem"] + estabelecimentos["cnpj_dv"]
+    )
+    estabelecimentos = estabelecimentos[estabelecimentos["cnpj"].isin(cnpjs)].copy()
+
+    for n in (1, 2):
+        estabelecimentos[f"ddd_telefone_{n}"] = estabelecimentos[f"ddd_{n}"] + estabelecimentos[f"telefone_{n}"]
+    estabelecimentos["ddd_fax"] = estabelecimentos["ddd_fax"] + estabelecimentos["fax"]
+    estabelecimentos = estabelecimentos.drop(
+        columns=["cnpj_ordem", "cnpj_dv", "ddd_1", "telefone_1", "ddd_2", "telefone_2", "fax"]
+    )
+
+    empresas = ler_tabela("empresas", basicos, destino)
+    # sem a empresa (razao social, natureza...) o registro fica incompleto e
+    # o CNPJ e tratado como ausente, para ser buscado na BrasilAPI
+    dados = estabelecimentos.merge(empresas, on="cnpj_basico", how="inner")
+    dados = dados[dados["razao_social"].notna()].copy()
+    if dados.empty:
+        return {}
+
+    # codigos e datas nos formatos da BrasilAPI
+    for coluna in CAMPOS_INTEIROS:
+        dados[coluna] = para_inteiro(dados[coluna])
+    for coluna in CAMPOS_DATA:
+        dados[coluna] = para_data(dados[coluna])
+    dados["capital_social"] = pd.to_numeric(
+        dados["capital_social"].astype("string").str.replace(",", ".", regex=False), errors="coerce"
+    )
+
+    # descricoes dos codigos
+    cnaes = ler_mapa("cnaes", destino)
+    paises = ler_mapa("paises", destino)
+    dados["descricao_identificador_matriz_filial"] = dados["identificador_matriz_filial"].map(MATRIZ_FILIAL)
+    dados["descricao_situacao_cadastral"] = dados["situacao_cadastral"].map(SITUACOES_CADASTRAIS)
+    dados["descricao_motivo_situacao_cadastral"] = dados["motivo_situacao_cadastral"].map(
+        ler_mapa("motivos", destino)
+    )
+    dados["natureza_juridica"] = dados["codigo_natureza_juridica"].map(ler_mapa("naturezas", destino))
+    dados["porte"] = dados["codigo_porte"].map(PORTES)
+    dados["cnae_fiscal_descricao"] = dados["cnae_fiscal"].map(cnaes)
+    dados["cnaes_secundarios"] = dados["cnaes_secundarios"].fillna("").map(
+        lambda codigos: [
+            {"codigo": int(c), "descricao": cnaes.get(int(c), "")}
+            for c in codigos.split(",") if c.strip().isdigit()
+        ]
+    )
+    dados["municipio"] = dados["codigo_municipio"].map(ler_mapa("municipios", destino))
+    dados["pais"] = dados["codigo_pais"].map(paises)
+
+    # qsa agrupado por empresa, com as qualificacoes por extenso
+    socios = ler_tabela("socios", basicos, destino)
+    for coluna in CAMPOS_INTEIROS_SOCIO:
+        socios[coluna] = para_inteiro(socios[coluna])
+    socios["data_entrada_sociedade"] = para_data(socios["data_entrada_sociedade"])
+
+    qualificacoes = ler_mapa("qualificacoes", destino)
+    socios["qualificacao_socio"] = socios["codigo_qualificacao_socio"].map(qualificacoes)
+    socios["qualificacao_representante_legal"] = socios["codigo_qualificacao_representante_legal"].map(
+        qualificacoes
+    )
+    socios["pais"] = socios["codigo_pais"].map(paises)
+    socios["faixa_etaria"] = socios["codigo_faixa_etaria"].map(FAIXAS_ETARIAS)
+
+    qsa_por_basico = {
+        basico: para_registros(grupo.drop(columns="cnpj_basico"))
+        for basico, grupo in socios.groupby("cnpj_basico")
+    }
+
+    resultado = {}
+    for registro in para_registros(dados):
+        registro["qsa"] = qsa_por_basico.get(registro.pop("cnpj_basico"), [])
+        resultado[registro["cnpj"]] = registro
+
+    return resultado
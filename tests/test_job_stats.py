@@ -0,0 +1,94 @@
+import importlib.util
+import json
+import os
+
+import pytest
+
+CAMINHO_MISSAO3 = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "missao3.py")
+
+
+@pytest.fixture
+def missao3():
+    spec = importlib.util.spec_from_file_location("missao3", CAMINHO_MISSAO3)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def criar_vaga(missao3, job_id, company, keyword='cfo', location='Brazil'):
+    return missao3.JobListing(
+        job_id=job_id,
+        title='CFO',
+        company=company,
+        location=location,
+        description='',
+        posted_date='2024-01-01',
+        url='',
+        scraped_at='2024-01-01T00:00:00',
+        search_keyword=keyword
+    )
+
+
+@pytest.fixture
+def csv_salvo(missao3, tmp_path):
+    scraper = missao3.LinkedInJobsScraper()
+    for job in [
+        criar_vaga(missao3, '1', 'Acme'),
+        criar_vaga(missao3, '2', 'Beta', keyword='diretor financeiro'),
+        criar_vaga(missao3, '3', 'Acme', location='São Paulo'),
+    ]:
+        scraper.jobs_collected.append(job)
+        scraper.jobs_seen.add(job.job_id)
+        scraper.stats.add(job, is_new=True)
+
+    filename = str(tmp_path / 'linkedin_jobs_1.csv')
+    scraper.save_to_csv(filename)
+    return filename
+
+
+def test_save_e_load_reaproveita_estatisticas(missao3, csv_salvo):
+    stats_file = missao3.JobStats.stats_filename(csv_salvo)
+    assert os.path.exists(stats_file)
+
+    scraper = missao3.LinkedInJobsScraper()
+    assert scraper.load_existing_csv(csv_salvo) == 3
+
+    stats = scraper.get_stats()
+    assert stats['total_jobs'] == 3
+    assert stats['new_jobs'] == 0
+    assert stats['known_jobs'] == 3
+    assert stats['unique_companies'] == 2
+    assert stats['jobs_per_keyword'] == {'cfo': 2, 'diretor financeiro': 1}
+    assert scraper.stats.csv_mtime == os.path.getmtime(csv_salvo)
+
+
+def test_estatisticas_salvas_sao_usadas_sem_recontar(missao3, csv_salvo):
+    stats_file = missao3.JobStats.stats_filename(csv_salvo)
+    with open(stats_file, encoding='utf-8') as f:
+        data = json.load(f)
+    data['counters']['company'] = {'Marcador': 3}
+    with open(stats_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+    scraper = missao3.LinkedInJobsScraper()
+    scraper.load_existing_csv(csv_salvo)
+
+    assert scraper.stats.top('company') == [('Marcador', 3)]
+
+
+def test_csv_editado_recalcula_estatisticas(missao3, csv_salvo):
+    with open(csv_salvo, encoding='utf-8') as f:
+        conteudo = f.read()
+    with open(csv_salvo, 'w', encoding='utf-8') as f:
+        f.write(conteudo.replace('Beta', 'Gama'))
+
+    # garante mtime diferente mesmo em sistemas de arquivos com baixa resolucao
+    mtime = os.path.getmtime(csv_salvo) + 10
+    os.utime(csv_salvo, (mtime, mtime))
+
+    scraper = missao3.LinkedInJobsScraper()
+    assert scraper.load_existing_csv(csv_salvo) == 3
+
+    companies = dict(scraper.stats.top('company'))
+    assert companies == {'Acme': 2, 'Gama': 1}
+    assert scraper.stats.known_jobs == 3
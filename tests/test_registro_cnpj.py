@@ -0,0 +1,169 @@
+import importlib.util
+import os
+import zipfile
+
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+CAMINHO_REGISTRO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "registro_cnpj.py")
+
+# Conteudo minimo de cada arquivo do dump: (nome do zip, nome do csv, linhas)
+DUMP = {
+    "empresas": ("Empresas0.zip", "K3241.K03200Y0.D40113.EMPRECSV", [
+        '"12345678";"ACME LTDA";"2062";"49";"1000,50";"03";""',
+        '"99887766";"BETA SA";"2054";"10";"5,00";"05";""',
+    ]),
+    "estabelecimentos": ("Estabelecimentos0.zip", "K3241.K03200Y0.D40113.ESTABELE", [
+        '"12345678";"0001";"90";"1";"ACME";"02";"20200101";"00";"";"105";"20000115";"6201501";'
+        '"6202300,6201501";"RUA";"X";"1";"";"CENTRO";"01000000";"SP";"7107";"11";"99999999";"";"";'
+        '"";"";"a@b.com";"";""',
+        '"99887766";"0001";"12";"2";"";"08";"";"01";"";"";"";"";"";"";"";"";"";"";"";"RJ";"6001";'
+        '"";"";"";"";"";"";"";"";""',
+    ]),
+    "socios": ("Socios0.zip", "K3241.K03200Y0.D40113.SOCIOCSV", [
+        '"12345678";"2";"JOSÉ SILVA";"***123***";"49";"20200101";"";"***000000**";"";"00";"5"',
+        '"12345678";"2";"MARIA SOUZA";"***456***";"22";"20210202";"";"***000000**";"";"00";"4"',
+    ]),
+    "municipios": ("Municipios.zip", "F.K03200$Z.D40113.MUNICCSV", ['"7107";"SAO PAULO"', '"6001";"RIO DE JANEIRO"']),
+    "qualificacoes": ("Qualificacoes.zip", "F.K03200$Z.D40113.QUALSCSV", [
+        '"49";"Sócio-Administrador"', '"22";"Sócio"', '"00";"Não informada"',
+    ]),
+    "cnaes": ("Cnaes.zip", "F.K03200$Z.D40113.CNAECSV", [
+        '"6201501";"Desenvolvimento de programas de computador sob encomenda"',
+        '"6202300";"Desenvolvimento e licenciamento de programas de computador customizáveis"',
+    ]),
+    "naturezas": ("Naturezas.zip", "F.K03200$Z.D40113.NATJUCSV", ['"2062";"Sociedade Empresária Limitada"']),
+    "motivos": ("Motivos.zip", "F.K03200$Z.D40113.MOTICSV", ['"00";"SEM MOTIVO"', '"01";"EXTINCAO POR ENCERRAMENTO"']),
+    "paises": ("Paises.zip", "F.K03200$Z.D40113.PAISCSV", ['"105";"BRASIL"']),
+}
+
+
+@pytest.fixture
+def registro():
+    spec = importlib.util.spec_from_file_location("registro_cnpj", CAMINHO_REGISTRO)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def criar_dump(pasta, tabelas=None):
+    os.makedirs(pasta, exist_ok=True)
+    for tabela in tabelas or DUMP:
+        nome_zip, nome_csv, linhas = DUMP[tabela]
+        with zipfile.ZipFile(os.path.join(pasta, nome_zip), "w") as z:
+            z.writestr(nome_csv, ("\n".join(linhas) + "\n").encode("latin-1"))
+    return str(pasta)
+
+
+@pytest.fixture
+def base(registro, tmp_path):
+    destino = str(tmp_path / "base")
+    registro.importar_dump(criar_dump(tmp_path / "dump"), destino, chunksize=1)
+    return destino
+
+
+def test_identificar_tabela(registro):
+    for tabela, (nome_zip, nome_csv, _) in DUMP.items():
+        assert registro.identificar_tabela(nome_zip) == tabela
+        assert registro.identificar_tabela(nome_csv) == tabela
+    assert registro.identificar_tabela("LEIAME.pdf") is None
+
+
+def test_importacao_particiona_por_prefixo(base):
+    assert sorted(os.listdir(os.path.join(base, "estabelecimentos"))) == ["12", "99"]
+    assert os.listdir(os.path.join(base, "socios")) == ["12"]
+
+
+def test_ida_e_volta(registro, base):
+    resultado = registro.consultar_cnpjs(["12345678000190", 99887766000112], base)
+    assert sorted(resultado) == ["12345678000190", "99887766000112"]
+
+    acme = resultado["12345678000190"]
+    assert acme["razao_social"] == "ACME LTDA"
+    assert acme["capital_social"] == 1000.5
+    assert acme["codigo_natureza_juridica"] == 2062
+    assert acme["natureza_juridica"] == "Sociedade Empresária Limitada"
+    assert acme["porte"] == "EMPRESA DE PEQUENO PORTE"
+    assert acme["situacao_cadastral"] == 2
+    assert acme["descricao_situacao_cadastral"] == "ATIVA"
+    assert acme["descricao_motivo_situacao_cadastral"] == "SEM MOTIVO"
+    assert acme["data_inicio_atividade"] == "2000-01-15"
+    assert acme["data_situacao_especial"] is None
+    assert acme["cnae_fiscal"] == 6201501
+    assert acme["cnae_fiscal_descricao"] == "Desenvolvimento de programas de computador sob encomenda"
+    assert [c["codigo"] for c in acme["cnaes_secundarios"]] == [6202300, 6201501]
+    assert acme["cnaes_secundarios"][0]["descricao"].startswith("Desenvolvimento e licenciamento")
+    assert acme["municipio"] == "SAO PAULO"
+    assert acme["pais"] == "BRASIL"
+    assert acme["ddd_telefone_1"] == "1199999999"
+    assert "cnpj_basico" not in acme
+
+    assert sorted(s["nome_socio"] for s in acme["qsa"]) == ["JOSÉ SILVA", "MARIA SOUZA"]
+    socio = next(s for s in acme["qsa"] if s["nome_socio"] == "JOSÉ SILVA")
+    assert socio["qualificacao_socio"] == "Sócio-Administrador"
+    assert socio["data_entrada_sociedade"] == "2020-01-01"
+    assert socio["faixa_etaria"] == "Entre 41 a 50 anos"
+
+    beta = resultado["99887766000112"]
+    assert beta["descricao_identificador_matriz_filial"] == "FILIAL"
+    assert beta["descricao_situacao_cadastral"] == "BAIXADA"
+    assert beta["cnaes_secundarios"] == []
+    assert beta["qsa"] == []
+
+
+def test_cnpj_ausente(registro, base, tmp_path):
+    assert registro.consultar_cnpjs(["11111111000111", "12345678000299"], base) == {}
+    assert registro.consultar_cnpjs(["12345678000190"], str(tmp_path / "sem_base")) == {}
+
+
+def test_base_parcial_sem_empresas_nao_conta_como_encontrado(registro, tmp_path):
+    destino = str(tmp_path / "parcial")
+    criar_dump(tmp_path / "dump", ["estabelecimentos"])
+    registro.importar_arquivo(
+        os.path.join(str(tmp_path / "dump"), DUMP["estabelecimentos"][0]), "estabelecimentos", destino
+    )
+
+    assert registro.consultar_cnpjs(["12345678000190"], destino) == {}
+
+
+def test_dump_parcial_mantem_tabelas_da_base_anterior(registro, base, tmp_path):
+    resultado = registro.importar_dump(criar_dump(tmp_path / "so_estab", ["estabelecimentos"]), base)
+
+    assert list(resultado) == ["estabelecimentos"]
+    assert "12345678000190" in registro.consultar_cnpjs(["12345678000190"], base)
+    assert registro.consultar_cnpjs(["12345678000190"], base)["12345678000190"]["qsa"]
+
+
+def test_dump_sem_tabela_obrigatoria_nao_cria_base(registro, tmp_path):
+    destino = str(tmp_path / "nova")
+    with pytest.raises(ValueError):
+        registro.importar_dump(criar_dump(tmp_path / "dump", ["estabelecimentos", "empresas"]), destino)
+
+    assert not os.path.exists(destino)
+    assert os.listdir(tmp_path) == ["dump"]
+
+
+@pytest.mark.parametrize("vazio", [True, False])
+def test_dump_vazio_ou_inexistente_mantem_base(registro, base, tmp_path, vazio):
+    pasta = tmp_path / "dump_vazio"
+    if vazio:
+        pasta.mkdir()
+
+    with pytest.raises((FileNotFoundError, ValueError)):
+        registro.importar_dump(str(pasta), base)
+
+    assert "12345678000190" in registro.consultar_cnpjs(["12345678000190"], base)
+
+
+def test_falha_na_importacao_mantem_base(registro, base, tmp_path):
+    pasta = criar_dump(tmp_path / "dump_ruim")
+    with open(os.path.join(pasta, "Socios1.zip"), "w") as f:
+        f.write("nao e zip")
+
+    with pytest.raises(Exception):
+        registro.importar_dump(pasta, base)
+
+    assert "12345678000190" in registro.consultar_cnpjs(["12345678000190"], base)
+    assert not [n for n in os.listdir(tmp_path) if ".tmp-" in n]
@@ -0,0 +1,134 @@
+import importlib.util
+import os
+
+import pytest
+
+CAMINHO_MISSAO2 = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "missao 2.py")
+
+
+@pytest.fixture
+def missao2(monkeypatch):
+    spec = importlib.util.spec_from_file_location("missao2", CAMINHO_MISSAO2)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    monkeypatch.setattr(modulo, "delay_aleatorio", lambda *args: None)
+    return modulo
+
+
+def criar_fonte(missao2, nome, resultado=None, erro=False, chamadas=None):
+    class Fonte(missao2.FonteCNPJ):
+        def buscar(self, driver, nome_empresa):
+            chamadas.append(self.nome)
+            if erro:
+                raise missao2.ErroFonte("fora do ar")
+            return resultado
+
+    fonte = Fonte()
+    fonte.nome = nome
+    return fonte
+
+
+def test_fonte_sem_buscar_falha_ao_criar(missao2):
+    class FonteIncompleta(missao2.FonteCNPJ):
+        nome = "incompleta"
+
+    with pytest.raises(TypeError):
+        FonteIncompleta()
+
+
+def test_nao_encontrado_nao_abre_circuito(missao2):
+    chamadas = []
+    seletor = missao2.SeletorFontes([
+        criar_fonte(missao2, "A", chamadas=chamadas),
+        criar_fonte(missao2, "B", chamadas=chamadas),
+    ])
+
+    for _ in range(5):
+        chamadas.clear()
+        assert seletor.buscar(None, "empresa desconhecida") is None
+        assert sorted(chamadas) == ["A", "B"]
+
+    assert all(e.aberto_desde is None for e in seletor.estados)
+
+
+def test_fonte_com_erro_vai_para_o_fim(missao2):
+    chamadas = []
+    seletor = missao2.SeletorFontes([
+        criar_fonte(missao2, "A", erro=True, chamadas=chamadas),
+        criar_fonte(missao2, "B", resultado="12345678000190", chamadas=chamadas),
+    ])
+
+    assert seletor.buscar(None, "empresa") == "12345678000190"
+    assert seletor.buscar(None, "empresa") == "12345678000190"
+    assert chamadas == ["A", "B", "B"]
+
+
+def test_todos_circuitos_abertos_tenta_todas_as_fontes(missao2):
+    chamadas = []
+    seletor = missao2.SeletorFontes(
+        [
+            criar_fonte(missao2, "A", erro=True, chamadas=chamadas),
+            criar_fonte(missao2, "B", erro=True, chamadas=chamadas),
+        ],
+        limite_falhas=2,
+        intervalo_sonda=300,
+    )
+
+    seletor.buscar(None, "empresa")
+    seletor.buscar(None, "empresa")
+    assert all(e.aberto_desde is not None for e in seletor.estados)
+
+    chamadas.clear()
+    seletor.buscar(None, "empresa")
+    assert sorted(chamadas) == ["A", "B"]
+
+
+def test_sonda_fecha_circuito_quando_fonte_recupera(missao2):
+    chamadas = []
+    fonte = criar_fonte(missao2, "A", erro=True, chamadas=chamadas)
+    seletor = missao2.SeletorFontes([fonte], limite_falhas=1, intervalo_sonda=0)
+
+    seletor.buscar(None, "empresa")
+    assert seletor.estados[0].aberto_desde is not None
+
+    seletor.estados[0].fonte = criar_fonte(missao2, "A", resultado="12345678000190", chamadas=chamadas)
+    assert seletor.buscar(None, "empresa") == "12345678000190"
+    assert seletor.estados[0].aberto_desde is None
+
+
+def test_fonte_rapida_com_um_erro_vem_antes_da_lenta(missao2):
+    chamadas = []
+    lenta = criar_fonte(missao2, "lenta", chamadas=chamadas)
+    rapida = criar_fonte(missao2, "rapida", chamadas=chamadas)
+    seletor = missao2.SeletorFontes([lenta, rapida])
+    estado_lento, estado_rapido = seletor.estados
+
+    # lenta sempre responde "nao encontrado" apos 15s; rapida teve um erro em 20
+    for _ in range(20):
+        estado_lento.registrar(True, 15.0, 0)
+    estado_rapido.registrar(False, 1.0, 0)
+    for _ in range(19):
+        estado_rapido.registrar(True, 1.0, 0)
+
+    assert [e.fonte.nome for e in seletor.ordenar()] == ["rapida", "lenta"]
+
+
+def test_fonte_mais_rapida_passa_a_frente(missao2):
+    chamadas = []
+
+    class FonteLenta(missao2.FonteCNPJ):
+        nome = "lenta"
+
+        def buscar(self, driver, nome_empresa):
+            chamadas.append(self.nome)
+            missao2.time.sleep(0.05)
+            return None
+
+    seletor = missao2.SeletorFontes([FonteLenta(), criar_fonte(missao2, "rapida", chamadas=chamadas)])
+
+    seletor.buscar(None, "empresa")
+    assert chamadas == ["lenta", "rapida"]
+
+    chamadas.clear()
+    seletor.buscar(None, "empresa")
+    assert chamadas == ["rapida", "lenta"]